@@ -168,6 +168,12 @@ class Server:
     self._max_body_bytes = max_body_bytes
     self._request_timeout_seconds = request_timeout_seconds
     self._debug = debug
+    # compile route patterns once so dispatch matches with precompiled
+    # pattern objects instead of re-compiling on every request
+    self.routes = [
+      (re.compile(path) if isinstance(path, str) else path, method, handler)
+      for path, method, handler in self.routes
+    ]
 
   # --- start server   -------------------------------------------------------
 
@@ -266,7 +272,7 @@ class Server:
 
     # map path to routes
     for route_path, route_method, request_handler in self.routes:
-      if method == route_method and re.match(route_path,path):
+      if method == route_method and route_path.match(path):
         response = request_handler(self,path,query_parameters, headers, body)
         self.debug(f"response status: {response.status_code}")
         self.debug(f"sending {response.headers['content-length']} bytes")
@@ -340,6 +346,8 @@ class Server:
       for data in self._handle_request(target, method, headers,
                                        content_length, buffered_client_socket):
         yield
+        if not data:   # bare yields (e.g. from websocket handlers)
+          continue
         for _ in buffered_client_socket.write(data):
           yield
 
@@ -11,7 +11,7 @@ import gc
 import wifi
 import socketpool
 from ehttpserver import Response, route
-from websocketserver import WebSocketServer, WS_OPCODE_TEXT, WS_OPCODE_CLOSE
+from websocketserver import WebSocketServer, WS_OPCODE_TEXT
 
 # WiFi credentials
 WIFI_SSID = "your-wifi-ssid"
@@ -42,21 +42,19 @@ ws.onmessage = e => {
     def handle_echo(self, path, headers, ws):
         """Echo any received text back to the client"""
         while not ws.closed:
-            opcode, payload = None, None
-            
             # Receive frame (non-blocking via generator)
-            for result in ws.recv_frame():
-                yield
-                if result:
-                    opcode, payload = result
-            
-            # Echo text messages
+            opcode, payload = yield from ws.recv_frame()
+            if opcode is None:
+                break  # client went away
+
+            # Echo text messages: the payload of a TEXT frame is already
+            # valid UTF-8, so resend the raw bytes without decode/re-encode
             if opcode == WS_OPCODE_TEXT:
-                yield from ws.send_text(payload.decode('utf-8'))
-            elif opcode == WS_OPCODE_CLOSE:
-                yield from ws.send_close()
-                break
-            
+                yield from ws.send_text_bytes(payload)
+            else:
+                # ping/close are handled by the connection's dispatch table
+                yield from ws.dispatch(opcode, payload)
+
             yield  # Let other connections run
 
 # Connect to WiFi
@@ -4,7 +4,7 @@ import mdns
 import socketpool
 
 from ehttpserver import Response, route
-from websocketserver import WebSocketServer, WS_OPCODE_TEXT, WS_OPCODE_CLOSE, WS_OPCODE_PING
+from websocketserver import WebSocketServer, WS_OPCODE_TEXT
 
 class MyWebSocketServer(WebSocketServer):
 
@@ -64,12 +64,8 @@ class MyWebSocketServer(WebSocketServer):
     try:
       while not ws.closed:
         # Receive a frame
-        opcode, payload = None, None
-        for result in ws.recv_frame():
-          yield
-          if result:
-            opcode, payload = result
-        
+        opcode, payload = yield from ws.recv_frame()
+
         if opcode is None:
           # Connection closed by client
           break
@@ -81,18 +77,12 @@ class MyWebSocketServer(WebSocketServer):
           self.debug(f"Received: {message}")
           echo_msg = f"Echo: {message}"
           yield from ws.send_text(echo_msg)
-          
-        elif opcode == WS_OPCODE_PING:
-          # Respond to ping with pong
-          self.debug("Received ping")
-          yield from ws.send_pong(payload)
-          
-        elif opcode == WS_OPCODE_CLOSE:
-          # Client initiated close
-          self.debug("Client closed connection")
-          yield from ws.send_close()
-          break
-        
+
+        else:
+          # ping and close are handled by the connection's dispatch
+          # table; a close sets ws.closed and ends the loop
+          yield from ws.dispatch(opcode, payload)
+
         # Allow other tasks to run
         yield
         
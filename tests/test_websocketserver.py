@@ -0,0 +1,145 @@
+"""
+Host-runnable tests for the WebSocket frame handling.
+
+Run from the repository root with `python -m unittest` or
+`python -m pytest -q`. A stub socketpool module is injected so
+ehttpserver imports on desktop Python.
+"""
+
+import sys
+import time
+import types
+import unittest
+
+# ehttpserver imports CircuitPython's socketpool at module level; stub
+# it out so the modules import on host Python
+if 'socketpool' not in sys.modules:
+  _socketpool = types.ModuleType('socketpool')
+  class _SocketPool:
+    SOL_SOCKET = 0
+    SO_REUSEADDR = 0
+  _socketpool.SocketPool = _SocketPool
+  sys.modules['socketpool'] = _socketpool
+
+from ehttpserver import BufferedNonBlockingSocket
+from websocketserver import (
+  WebSocketConnection,
+  WS_OPCODE_TEXT, WS_OPCODE_BINARY, WS_OPCODE_PING, WS_OPCODE_PONG,
+  WS_OPCODE_CLOSE,
+)
+
+
+class FakeSocket:
+  """In-memory stand-in for a socketpool socket"""
+
+  def __init__(self, data=b""):
+    self.data = bytearray(data)
+    self.sent = bytearray()
+
+  def recv_into(self, buf, nbytes):
+    n = min(nbytes, len(self.data), len(buf))
+    buf[:n] = self.data[:n]
+    del self.data[:n]
+    return n  # 0 once drained, which read() treats as connection closed
+
+  def send(self, data):
+    self.sent.extend(bytes(data))
+    return len(data)
+
+
+def make_client_frame(opcode, payload, mask=b'\x1b\x2c\x3d\x4e'):
+  """Build a masked client-to-server frame (FIN=1)"""
+  frame = bytearray([0x80 | opcode])
+  n = len(payload)
+  if n < 126:
+    frame.append(0x80 | n)
+  elif n < 65536:
+    frame += bytes([0x80 | 126]) + n.to_bytes(2, 'big')
+  else:
+    frame += bytes([0x80 | 127]) + n.to_bytes(8, 'big')
+  frame += mask
+  frame += bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+  return bytes(frame)
+
+
+def run(gen):
+  """Drain a generator and return its StopIteration value"""
+  try:
+    while True:
+      next(gen)
+  except StopIteration as e:
+    return e.value
+
+
+def make_connection(raw):
+  sock = FakeSocket(raw)
+  buffered = BufferedNonBlockingSocket(sock, time.monotonic())
+  return WebSocketConnection(buffered), sock
+
+
+class TestRecvFrame(unittest.TestCase):
+
+  def test_two_frames_in_one_buffer(self):
+    # regression: every consumed field must advance the socket buffer,
+    # otherwise the second frame is parsed from stale bytes
+    raw = (make_client_frame(WS_OPCODE_TEXT, b'first') +
+           make_client_frame(WS_OPCODE_TEXT, b'second'))
+    ws, _ = make_connection(raw)
+    opcode, payload = run(ws.recv_frame())
+    self.assertEqual((opcode, bytes(payload)), (WS_OPCODE_TEXT, b'first'))
+    opcode, payload = run(ws.recv_frame())
+    self.assertEqual((opcode, bytes(payload)), (WS_OPCODE_TEXT, b'second'))
+
+  def test_payload_sizes_across_unmask_tiers(self):
+    # covers the unrolled, bulk-XOR, and 126/127 length paths
+    for n in (0, 1, 3, 7, 8, 31, 32, 300, 70000):
+      payload = bytes(i & 0xFF for i in range(n))
+      ws, _ = make_connection(make_client_frame(WS_OPCODE_BINARY, payload))
+      opcode, got = run(ws.recv_frame())
+      self.assertEqual(opcode, WS_OPCODE_BINARY, n)
+      self.assertEqual(bytes(got), payload, n)
+
+  def test_extended_length_followed_by_second_frame(self):
+    big = bytes(range(256)) * 2  # 512 bytes -> 126 length encoding
+    raw = (make_client_frame(WS_OPCODE_BINARY, big) +
+           make_client_frame(WS_OPCODE_TEXT, b'tail'))
+    ws, _ = make_connection(raw)
+    opcode, payload = run(ws.recv_frame())
+    self.assertEqual((opcode, bytes(payload)), (WS_OPCODE_BINARY, big))
+    opcode, payload = run(ws.recv_frame())
+    self.assertEqual((opcode, bytes(payload)), (WS_OPCODE_TEXT, b'tail'))
+
+  def test_closed_connection_returns_none(self):
+    ws, _ = make_connection(b'\x81')  # truncated header
+    self.assertEqual(run(ws.recv_frame()), (None, None))
+
+
+class TestDispatch(unittest.TestCase):
+
+  def test_ping_dispatch_sends_pong(self):
+    ws, sock = make_connection(make_client_frame(WS_OPCODE_PING, b'abc'))
+    opcode, payload = run(ws.recv_frame())
+    self.assertEqual(opcode, WS_OPCODE_PING)
+    run(ws.dispatch(opcode, payload))
+    self.assertEqual(bytes(sock.sent), b'\x8a\x03abc')
+
+  def test_close_dispatch_completes_handshake(self):
+    ws, sock = make_connection(make_client_frame(WS_OPCODE_CLOSE, b''))
+    opcode, payload = run(ws.recv_frame())
+    run(ws.dispatch(opcode, payload))
+    self.assertTrue(ws.closed)
+    self.assertEqual(bytes(sock.sent)[:2], b'\x88\x02')
+
+
+class TestSendFrame(unittest.TestCase):
+
+  def test_echo_roundtrip(self):
+    message = b'hello websocket'
+    ws, sock = make_connection(make_client_frame(WS_OPCODE_TEXT, message))
+    opcode, payload = run(ws.recv_frame())
+    run(ws.send_text_bytes(payload))
+    self.assertEqual(bytes(sock.sent), bytes([0x81, len(message)]) + message)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -13,12 +13,8 @@ Usage:
         @route("/ws", "WEBSOCKET")
         def handle_ws(self, path, headers, ws):
             while not ws.closed:
-                opcode, payload = None, None
-                for result in ws.recv_frame():
-                    yield
-                    if result:
-                        opcode, payload = result
-                
+                opcode, payload = yield from ws.recv_frame()
+
                 if opcode == WS_OPCODE_TEXT:
                     yield from ws.send_text(payload.decode('utf-8'))
                 elif opcode == WS_OPCODE_CLOSE:
@@ -28,6 +24,12 @@ Usage:
 """
 
 import re
+import struct
+try:
+  import asyncio
+except ImportError:
+  # CircuitPython builds without asyncio use the generator classes only
+  asyncio = None
 try:
   import hashlib
   import binascii
@@ -36,6 +38,20 @@ except ImportError:
   hashlib = None
   binascii = None
 
+try:
+  # pybase64 mirrors the binascii API and links against a SIMD Base64
+  # implementation on hosts that support it
+  import pybase64 as _b64
+except ImportError:
+  _b64 = binascii
+
+try:
+  # optional native unmasking kernel for CPython hosts; the compiler
+  # auto-vectorizes its XOR loop, pure Python is used where absent
+  from _ws_speedups import ws_unmask as _ws_unmask_native
+except ImportError:
+  _ws_unmask_native = None
+
 from ehttpserver import Server, Response
 
 __version__ = "0.0.0+auto.0"
@@ -44,6 +60,18 @@ __repo__ = "https://github.com/bablokb/ehttpserver.git"
 # WebSocket protocol constants
 _WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
 
+# prebuilt 101 response with a fixed slot for the accept key, which is
+# always exactly 28 Base64 characters for a 20-byte SHA-1 digest
+_UPGRADE_TEMPLATE = bytearray(
+  b"HTTP/1.1 101 Switching Protocols\r\n"
+  b"Upgrade: websocket\r\n"
+  b"Connection: Upgrade\r\n"
+  b"Sec-WebSocket-Accept: " + b" " * 28 + b"\r\n"
+  b"\r\n"
+)
+_ACCEPT_OFF = (_UPGRADE_TEMPLATE.index(b"Sec-WebSocket-Accept: ")
+               + len(b"Sec-WebSocket-Accept: "))
+
 # WebSocket opcodes (exported for use in handlers)
 WS_OPCODE_CONTINUATION = 0x0
 WS_OPCODE_TEXT = 0x1
@@ -52,14 +80,98 @@ WS_OPCODE_CLOSE = 0x8
 WS_OPCODE_PING = 0x9
 WS_OPCODE_PONG = 0xA
 
+def _ws_unmask(payload, mask_key):
+  """Unmask a client frame payload in bulk, return the unmasked buffer
+
+  For payloads of 32 bytes and more, the XOR is done with a single
+  big-integer operation instead of a Python loop: the 4-byte mask is
+  tiled to payload length and both buffers are XORed as ints. This
+  replaces per-byte interpreter dispatch with a few C-level calls.
+  Shorter payloads XOR with the four mask bytes unpacked into locals
+  in a 4-wide unrolled loop, with no `% 4` or mask indexing; at these
+  sizes any fancier setup costs more than the loop itself.
+
+  If the optional `_ws_speedups` extension is importable, its compiled
+  in-place kernel is used instead of either pure-Python path.
+  """
+  if _ws_unmask_native is not None:
+    _ws_unmask_native(payload, bytes(mask_key))
+    return payload
+  payload_len = len(payload)
+  if payload_len >= 32:
+    tile = (bytes(mask_key) * ((payload_len + 3) // 4))[:payload_len]
+    return (int.from_bytes(bytes(payload), 'big') ^
+            int.from_bytes(tile, 'big')).to_bytes(payload_len, 'big')
+  m0, m1, m2, m3 = mask_key
+  tail = payload_len & ~3
+  for i in range(0, tail, 4):
+    payload[i] ^= m0
+    payload[i + 1] ^= m1
+    payload[i + 2] ^= m2
+    payload[i + 3] ^= m3
+  mask = (m0, m1, m2, m3)
+  for i in range(tail, payload_len):
+    payload[i] ^= mask[i & 3]
+  return payload
+
+
+def _read_exactly(buffered_socket, size):
+  """Read exactly `size` bytes from a buffered socket (generator)
+
+  Fills a preallocated buffer and yields only when the socket would
+  block, so data already sitting in the read buffer is drained without
+  a scheduler round-trip per chunk. Returns the buffer; it is shorter
+  than `size` only if the peer closed the connection first.
+  """
+  buf = bytearray(size)
+  off = 0
+  # read(size=size) terminates by itself once `size` bytes were served
+  # (or the peer closed); breaking out early would abandon it before it
+  # advances its buffer pointer past the bytes it just yielded
+  for data in buffered_socket.read(size=size):
+    if data:
+      buf[off:off + len(data)] = data
+      off += len(data)
+    else:
+      yield
+  if off < size:
+    return buf[:off]  # peer closed the connection early
+  return buf
+
+
+def _ws_frame_header(opcode, payload_len):
+  """Build a server frame header (FIN=1, unmasked) for a payload length"""
+  if payload_len < 126:
+    return struct.pack('>BB', 0x80 | (opcode & 0x0F), payload_len)
+  elif payload_len < 65536:
+    return struct.pack('>BBH', 0x80 | (opcode & 0x0F), 126, payload_len)
+  return struct.pack('>BBQ', 0x80 | (opcode & 0x0F), 127, payload_len)
+
+
+# small cache of recently computed accept keys; reconnecting clients
+# (and test tools) often resend the same nonce, which then skips the
+# SHA-1 + Base64 work entirely
+_accept_cache = {}
+_ACCEPT_CACHE_SIZE = 16
+
 def _ws_make_accept_key(client_key):
   """Generate Sec-WebSocket-Accept header value from client key"""
+  accept_key = _accept_cache.get(client_key)
+  if accept_key is not None:
+    return accept_key
   if not hashlib or not binascii:
     raise RuntimeError("WebSocket requires hashlib and binascii modules")
-  sha1 = hashlib.sha1()
-  sha1.update(client_key.encode('ascii') if isinstance(client_key, str) else client_key)
-  sha1.update(_WS_GUID)
-  return binascii.b2a_base64(sha1.digest()).strip().decode('ascii')
+  # key + GUID fit in one SHA-1 block, so hash them in a single call
+  # instead of two update()s; this also lets hardware-accelerated
+  # (SHA-NI) OpenSSL backends take their fast one-shot path
+  key_bytes = client_key.encode('ascii') if isinstance(client_key, str) else client_key
+  digest = hashlib.sha1(key_bytes + _WS_GUID).digest()
+  accept_key = _b64.b2a_base64(digest, newline=False).decode('ascii')
+  if len(_accept_cache) >= _ACCEPT_CACHE_SIZE:
+    # evict the oldest entry (dicts keep insertion order)
+    _accept_cache.pop(next(iter(_accept_cache)))
+  _accept_cache[client_key] = accept_key
+  return accept_key
 
 
 class WebSocketConnection:
@@ -71,29 +183,25 @@ class WebSocketConnection:
     
   def send_frame(self, opcode, payload):
     """Send a WebSocket frame (generator for non-blocking)"""
-    frame = bytearray()
-    # First byte: FIN=1, RSV=0, opcode
-    frame.append(0x80 | (opcode & 0x0F))
-    
-    # Second byte and payload length
-    payload_len = len(payload)
-    if payload_len < 126:
-      frame.append(payload_len)
-    elif payload_len < 65536:
-      frame.append(126)
-      frame.append((payload_len >> 8) & 0xFF)
-      frame.append(payload_len & 0xFF)
-    else:
-      frame.append(127)
-      for i in range(7, -1, -1):
-        frame.append((payload_len >> (8 * i)) & 0xFF)
-    
-    # Send frame header + payload
-    yield from self.buffered_socket.write(frame + payload)
+    frame = _ws_frame_header(opcode, len(payload))
+
+    # Send header and payload back-to-back; writing them separately
+    # avoids allocating and copying a header+payload buffer per frame
+    yield from self.buffered_socket.write(frame)
+    if payload:
+      yield from self.buffered_socket.write(payload)
   
   def send_text(self, text):
-    """Send text message (generator)"""
-    payload = text.encode('utf-8') if isinstance(text, str) else text
+    """Send text message given as a str (generator)"""
+    yield from self.send_frame(WS_OPCODE_TEXT, text.encode('utf-8'))
+
+  def send_text_bytes(self, payload):
+    """Send a text message whose UTF-8 encoding is already in hand,
+    skipping the encode step (generator)
+
+    The caller must guarantee the payload is valid UTF-8, e.g. bytes
+    echoed from a received TEXT frame.
+    """
     yield from self.send_frame(WS_OPCODE_TEXT, payload)
   
   def send_binary(self, data):
@@ -108,80 +216,197 @@ class WebSocketConnection:
     """Send close frame (generator)"""
     payload = bytearray()
     if code is not None:
-      payload.append((code >> 8) & 0xFF)
-      payload.append(code & 0xFF)
+      payload += struct.pack('>H', code)
       if reason:
-        payload.extend(reason.encode('utf-8')[:123])  # Max 125 bytes total
+        encoded = reason.encode('utf-8')
+        # Max 125 bytes total; slice only when the reason is too long
+        payload += encoded[:123] if len(encoded) > 123 else encoded
     yield from self.send_frame(WS_OPCODE_CLOSE, payload)
     self.closed = True
   
+  def _on_ping(self, payload):
+    """Default PING handler: reply with a pong (generator)"""
+    yield from self.send_pong(payload)
+
+  def _on_close(self, payload):
+    """Default CLOSE handler: complete the closing handshake (generator)"""
+    yield from self.send_close()
+
+  # opcode -> default handler; one dict lookup replaces the if/elif
+  # chain handlers would otherwise walk per frame
+  _OPCODE_DISPATCH = {
+    WS_OPCODE_PING: _on_ping,
+    WS_OPCODE_CLOSE: _on_close,
+  }
+
+  def dispatch(self, opcode, payload):
+    """Run the default handler for an opcode, if one exists (generator)
+
+    Covers the protocol-level frames (ping, close); handlers keep
+    application frames (text, binary) to themselves.
+    """
+    handler = self._OPCODE_DISPATCH.get(opcode)
+    if handler:
+      yield from handler(self, payload)
+
   def recv_frame(self):
     """Receive and parse a WebSocket frame (generator)
-    
-    Yields during I/O, returns (opcode, payload) when complete
+
+    Yields during I/O and returns (opcode, payload) when complete, so
+    handlers consume it as: opcode, payload = yield from ws.recv_frame()
+
+    The payload is returned as the receive buffer itself (bytearray or
+    bytes) without a defensive copy; treat it as invalid once the next
+    recv_frame() call starts and copy it if it must be retained.
     """
     # Read first 2 bytes
-    header = bytearray()
-    for data in self.buffered_socket.read(size=2):
-      yield
-      header.extend(data)
-      if len(header) >= 2:
-        break
-    
+    header = yield from _read_exactly(self.buffered_socket, 2)
     if len(header) < 2:
       return None, None  # Connection closed
-    
+
     b1, b2 = header[0], header[1]
     fin = (b1 >> 7) & 1
     opcode = b1 & 0x0F
     masked = (b2 >> 7) & 1
     payload_len = b2 & 0x7F
-    
+
     # Read extended payload length if needed
     if payload_len == 126:
-      len_bytes = bytearray()
-      for data in self.buffered_socket.read(size=2):
-        yield
-        len_bytes.extend(data)
-        if len(len_bytes) >= 2:
-          break
-      payload_len = (len_bytes[0] << 8) | len_bytes[1]
+      len_bytes = yield from _read_exactly(self.buffered_socket, 2)
+      if len(len_bytes) < 2:
+        return None, None
+      payload_len = struct.unpack('>H', bytes(len_bytes))[0]
     elif payload_len == 127:
-      len_bytes = bytearray()
-      for data in self.buffered_socket.read(size=8):
-        yield
-        len_bytes.extend(data)
-        if len(len_bytes) >= 8:
-          break
-      payload_len = 0
-      for b in len_bytes:
-        payload_len = (payload_len << 8) | b
-    
+      len_bytes = yield from _read_exactly(self.buffered_socket, 8)
+      if len(len_bytes) < 8:
+        return None, None
+      payload_len = struct.unpack('>Q', bytes(len_bytes))[0]
+
     # Read masking key if present
     mask_key = None
     if masked:
-      mask_key = bytearray()
-      for data in self.buffered_socket.read(size=4):
-        yield
-        mask_key.extend(data)
-        if len(mask_key) >= 4:
-          break
-    
-    # Read payload
-    payload = bytearray()
+      mask_key = yield from _read_exactly(self.buffered_socket, 4)
+      if len(mask_key) < 4:
+        return None, None
+
+    # Read payload (preallocated to payload_len inside the helper)
+    payload = bytearray(0)
     if payload_len > 0:
-      for data in self.buffered_socket.read(size=payload_len):
-        yield
-        payload.extend(data)
-        if len(payload) >= payload_len:
-          break
-    
-    # Unmask payload if needed
-    if masked and mask_key:
-      for i in range(len(payload)):
-        payload[i] ^= mask_key[i % 4]
+      payload = yield from _read_exactly(self.buffered_socket, payload_len)
     
-    return opcode, bytes(payload)
+    # Unmask payload if needed (mask_key is set iff masked)
+    if masked:
+      payload = _ws_unmask(payload, mask_key)
+
+    return opcode, payload
+
+
+class AsyncWebSocketConnection:
+  """asyncio variant of WebSocketConnection for CPython hosts
+
+  Wraps an asyncio StreamReader/StreamWriter pair. Each readexactly()
+  awaits a complete field, so the event loop schedules at natural frame
+  boundaries instead of stepping a generator on every partial read.
+  The generator-based WebSocketConnection remains the CircuitPython
+  path.
+  """
+
+  def __init__(self, reader, writer):
+    self.reader = reader
+    self.writer = writer
+    self.closed = False
+
+  async def send_frame(self, opcode, payload):
+    """Send a WebSocket frame"""
+    self.writer.write(_ws_frame_header(opcode, len(payload)))
+    if payload:
+      self.writer.write(payload)
+    await self.writer.drain()
+
+  async def send_text(self, text):
+    """Send text message given as a str"""
+    await self.send_frame(WS_OPCODE_TEXT, text.encode('utf-8'))
+
+  async def send_text_bytes(self, payload):
+    """Send a text message whose UTF-8 encoding is already in hand"""
+    await self.send_frame(WS_OPCODE_TEXT, payload)
+
+  async def send_binary(self, data):
+    """Send binary message"""
+    await self.send_frame(WS_OPCODE_BINARY, data)
+
+  async def send_pong(self, payload=b""):
+    """Send pong response"""
+    await self.send_frame(WS_OPCODE_PONG, payload)
+
+  async def send_close(self, code=1000, reason=""):
+    """Send close frame"""
+    payload = bytearray()
+    if code is not None:
+      payload += struct.pack('>H', code)
+      if reason:
+        encoded = reason.encode('utf-8')
+        # Max 125 bytes total; slice only when the reason is too long
+        payload += encoded[:123] if len(encoded) > 123 else encoded
+    await self.send_frame(WS_OPCODE_CLOSE, payload)
+    self.closed = True
+
+  async def _on_ping(self, payload):
+    """Default PING handler: reply with a pong"""
+    await self.send_pong(payload)
+
+  async def _on_close(self, payload):
+    """Default CLOSE handler: complete the closing handshake"""
+    await self.send_close()
+
+  _OPCODE_DISPATCH = {
+    WS_OPCODE_PING: _on_ping,
+    WS_OPCODE_CLOSE: _on_close,
+  }
+
+  async def dispatch(self, opcode, payload):
+    """Run the default handler for an opcode, if one exists"""
+    handler = self._OPCODE_DISPATCH.get(opcode)
+    if handler:
+      await handler(self, payload)
+
+  async def recv_frame(self):
+    """Receive and parse a WebSocket frame
+
+    Returns (opcode, payload), or (None, None) if the peer closed the
+    connection mid-frame. The payload is the receive buffer itself,
+    not a copy; copy it if it must outlive the next recv_frame() call.
+    """
+    try:
+      header = await self.reader.readexactly(2)
+      b1, b2 = header[0], header[1]
+      opcode = b1 & 0x0F
+      masked = (b2 >> 7) & 1
+      payload_len = b2 & 0x7F
+
+      if payload_len == 126:
+        payload_len = struct.unpack('>H', await self.reader.readexactly(2))[0]
+      elif payload_len == 127:
+        payload_len = struct.unpack('>Q', await self.reader.readexactly(8))[0]
+
+      mask_key = None
+      if masked:
+        mask_key = await self.reader.readexactly(4)
+
+      payload = b""
+      if payload_len > 0:
+        payload = await self.reader.readexactly(payload_len)
+        if masked and (payload_len < 32 or _ws_unmask_native is not None):
+          # these unmask paths mutate in place and need a mutable
+          # buffer; the bigint path takes the bytes as-is
+          payload = bytearray(payload)
+    except asyncio.IncompleteReadError:
+      return None, None
+
+    if masked:
+      payload = _ws_unmask(payload, mask_key)
+
+    return opcode, payload
 
 
 class WebSocketServer(Server):
@@ -198,12 +423,8 @@ class WebSocketServer(Server):
       @route("/ws", "WEBSOCKET")
       def handle_websocket(self, path, headers, ws):
           while not ws.closed:
-              opcode, payload = None, None
-              for result in ws.recv_frame():
-                  yield
-                  if result:
-                      opcode, payload = result
-              
+              opcode, payload = yield from ws.recv_frame()
+
               if opcode == WS_OPCODE_TEXT:
                   yield from ws.send_text(payload.decode('utf-8'))
               elif opcode == WS_OPCODE_CLOSE:
@@ -211,23 +432,43 @@ class WebSocketServer(Server):
                   break
               yield
   """
-  
-  def _handle_websocket_upgrade(self, headers, buffered_client_socket):
-    """Handle WebSocket upgrade handshake and return WebSocketConnection"""
-    
+
+  # characters that make a route path a real regex rather than a literal
+  _RE_METACHARS = '.*+?{}[]()|\\'
+
+  def __init__(self, *args, **kwargs):
+    """ constructor """
+    # Split WEBSOCKET routes into an exact-path dict (the common case,
+    # e.g. "/ws") and a list of precompiled patterns, so upgrade
+    # dispatch is one dict lookup instead of an O(routes) regex scan.
+    # Runs before the base constructor, which replaces the raw pattern
+    # strings in self.routes with compiled pattern objects.
+    self._ws_routes_exact = {}
+    self._ws_routes_re = []
+    for route_path, route_method, request_handler in self.routes:
+      if route_method != 'WEBSOCKET':
+        continue
+      path = route_path[1:-1]  # routes are registered as f"^{path}$"
+      if not any(c in self._RE_METACHARS for c in path):
+        self._ws_routes_exact[path] = request_handler
+      else:
+        self._ws_routes_re.append((re.compile(route_path), request_handler))
+    super().__init__(*args, **kwargs)
+
+  def _handle_websocket_upgrade(self, headers, connection,
+                                buffered_client_socket):
+    """Handle WebSocket upgrade handshake and return WebSocketConnection
+
+    `connection` is the lower-cased Connection header value, computed
+    once by the caller (which already verified the Upgrade header).
+    """
+
     # Validate WebSocket handshake headers
     ws_key = headers.get('sec-websocket-key')
-    if not ws_key:
+    if not ws_key or 'upgrade' not in connection:
       yield from Response("Bad Request", 400).serialize()
       return None
-    
-    upgrade = headers.get('upgrade', '').lower()
-    connection = headers.get('connection', '').lower()
-    
-    if upgrade != 'websocket' or 'upgrade' not in connection:
-      yield from Response("Bad Request", 400).serialize()
-      return None
-    
+
     # Generate accept key
     try:
       accept_key = _ws_make_accept_key(ws_key)
@@ -236,15 +477,11 @@ class WebSocketServer(Server):
       yield from Response("Internal Server Error", 500).serialize()
       return None
     
-    # Send upgrade response
-    response = (
-      b"HTTP/1.1 101 Switching Protocols\r\n"
-      b"Upgrade: websocket\r\n"
-      b"Connection: Upgrade\r\n"
-      b"Sec-WebSocket-Accept: " + accept_key.encode('ascii') + b"\r\n"
-      b"\r\n"
-    )
-    
+    # Send upgrade response: patch the accept key into a copy of the
+    # prebuilt template instead of concatenating byte strings
+    response = _UPGRADE_TEMPLATE[:]
+    response[_ACCEPT_OFF:_ACCEPT_OFF + 28] = accept_key.encode('ascii')
+
     for _ in buffered_client_socket.write(response):
       yield
     
@@ -262,31 +499,36 @@ class WebSocketServer(Server):
     """
     
     self.debug(f"_handle_request for {target}")
-    
-    # Check for WebSocket upgrade
-    if (headers.get('upgrade', '').lower() == 'websocket' and 
-        method == 'GET'):
-      ws_conn = None
-      for result in self._handle_websocket_upgrade(headers, buffered_client_socket):
-        yield
-        if isinstance(result, WebSocketConnection):
-          ws_conn = result
-      
-      if ws_conn:
-        # Extract path for routing
-        path = target.split("?", 1)[0] if "?" in target else target
-        
-        # Find matching WebSocket handler
-        for route_path, route_method, request_handler in self.routes:
-          if route_method == 'WEBSOCKET' and re.match(route_path, path):
-            yield from request_handler(self, path, headers, ws_conn)
-            return
-        
-        # No handler found, close connection
-        self.debug("No WebSocket handler found")
-        yield from ws_conn.send_close()
+
+    # Fast path: anything that is not a GET with an Upgrade header is
+    # plain HTTP; checking the method first keeps the common case free
+    # of .lower() allocations
+    upgrade = headers.get('upgrade')
+    if method != 'GET' or not upgrade or upgrade.lower() != 'websocket':
+      yield from super()._handle_request(target, method, headers,
+                                         content_length, buffered_client_socket)
       return
-    
-    # Not a WebSocket request, delegate to parent class
-    yield from super()._handle_request(target, method, headers, 
-                                       content_length, buffered_client_socket)
+
+    connection = headers.get('connection', '').lower()
+    ws_conn = yield from self._handle_websocket_upgrade(
+      headers, connection, buffered_client_socket)
+
+    if ws_conn:
+      # Extract path for routing
+      path = target.split("?", 1)[0] if "?" in target else target
+
+      # Find matching WebSocket handler: exact-path dict first,
+      # then the precompiled regex routes
+      request_handler = self._ws_routes_exact.get(path)
+      if request_handler is None:
+        for pattern, handler in self._ws_routes_re:
+          if pattern.match(path):
+            request_handler = handler
+            break
+      if request_handler:
+        yield from request_handler(self, path, headers, ws_conn)
+        return
+
+      # No handler found, close connection
+      self.debug("No WebSocket handler found")
+      yield from ws_conn.send_close()